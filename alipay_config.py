@@ -5,9 +5,13 @@
 """
 
 import os
+import re
+import base64
 import logging
 from pathlib import Path
 from dotenv import load_dotenv
+from Crypto.PublicKey import RSA
+from Crypto.Signature import pkcs1_15
 
 # 配置日志
 logging.basicConfig(
@@ -16,6 +20,14 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# PEM 头尾标记及所有空白字符，一次正则替换即可剥离
+_PEM_STRIP_RE = re.compile(r"-----(?:BEGIN|END)[^-]+-----|\s")
+
+
+def strip_pem(key_raw: str) -> str:
+    """移除密钥字符串中的 PEM 头尾标记和空白字符，返回 base64 主体"""
+    return _PEM_STRIP_RE.sub("", key_raw)
+
 
 class Config:
     """配置管理类"""
@@ -26,25 +38,29 @@ class Config:
         env_path = Path(__file__).parent / '.env'
         
         if env_path.exists():
-            logger.info(f"加载配置文件: {env_path}")
+            logger.info("加载配置文件: %s", env_path)
             load_dotenv(env_path)
         else:
-            logger.warning(f"未找到 .env 配置文件: {env_path}，使用环境变量或默认值")
+            logger.warning("未找到 .env 配置文件: %s，使用环境变量或默认值", env_path)
             load_dotenv()  # 加载系统环境变量
 
+        # 一次性快照环境变量，后续读取不再经过 os.environ 的编解码
+        # 快照仅在初始化期间使用，不保存到实例上，避免长期持有无关的敏感变量
+        env = dict(os.environ)
+
         # 加载支付宝配置
-        self._load_alipay_config()
+        self._load_alipay_config(env)
         # 加载 EPay 配置
-        self._load_epay_config()
+        self._load_epay_config(env)
         # 加载集成配置
-        self._load_integration_config()
+        self._load_integration_config(env)
 
-    def _load_alipay_config(self):
+    def _load_alipay_config(self, env: dict):
         """加载支付宝相关配置"""
         # 必需配置项
-        self.app_id = os.getenv('ALIPAY_APP_ID', '').strip()
-        self.app_private_key = os.getenv('ALIPAY_APP_PRIVATE_KEY', '').strip()
-        self.alipay_public_key = os.getenv('ALIPAY_PUBLIC_KEY', '').strip()
+        self.app_id = env.get('ALIPAY_APP_ID', '').strip()
+        self.app_private_key = env.get('ALIPAY_APP_PRIVATE_KEY', '').strip()
+        self.alipay_public_key = env.get('ALIPAY_PUBLIC_KEY', '').strip()
 
         # 验证必需的配置项
         if not self.app_id:
@@ -55,17 +71,17 @@ class Config:
             raise ValueError("❌ 配置错误: 缺少 ALIPAY_PUBLIC_KEY，请在 .env 文件中配置")
 
         # 可选配置项（使用默认值）
-        self.sign_type = os.getenv('ALIPAY_SIGN_TYPE', 'RSA2').upper()
-        self.format = os.getenv('ALIPAY_FORMAT', 'json').lower()
-        self.charset = os.getenv('ALIPAY_CHARSET', 'utf-8').lower()
+        self.sign_type = env.get('ALIPAY_SIGN_TYPE', 'RSA2').upper()
+        self.format = env.get('ALIPAY_FORMAT', 'json').lower()
+        self.charset = env.get('ALIPAY_CHARSET', 'utf-8').lower()
 
         # 沙箱环境配置
-        sandbox_env = os.getenv('ALIPAY_IS_SANDBOX', 'false').lower()
+        sandbox_env = env.get('ALIPAY_IS_SANDBOX', 'false').lower()
         self.is_sandbox = sandbox_env in ('true', '1', 'yes', 'on')
 
         # 回调地址配置
-        self.notify_url = os.getenv('ALIPAY_NOTIFY_URL', 'http://localhost:5000/api/notify').strip()
-        self.return_url = os.getenv('ALIPAY_RETURN_URL', 'http://localhost:5000/alipay/return').strip()
+        self.notify_url = env.get('ALIPAY_NOTIFY_URL', 'http://localhost:5000/api/notify').strip()
+        self.return_url = env.get('ALIPAY_RETURN_URL', 'http://localhost:5000/alipay/return').strip()
 
         # 网关地址（根据是否使用沙箱）
         self.gateway = (
@@ -75,71 +91,71 @@ class Config:
         )
 
         # 日志输出配置信息
-        logger.info(f"✓ 支付宝配置已加载")
-        logger.debug(f"  - AppID: {self.app_id}")
-        logger.debug(f"  - 签名方式: {self.sign_type}")
-        logger.debug(f"  - 沙箱环境: {self.is_sandbox}")
-        logger.debug(f"  - 网关: {self.gateway}")
+        logger.info("✓ 支付宝配置已加载")
+        logger.debug("  - AppID: %s", self.app_id)
+        logger.debug("  - 签名方式: %s", self.sign_type)
+        logger.debug("  - 沙箱环境: %s", self.is_sandbox)
+        logger.debug("  - 网关: %s", self.gateway)
 
-    def _load_epay_config(self):
+    def _load_epay_config(self, env: dict):
         """加载 New-API EPay 相关配置【新增】"""
         # EPay 商户配置（与 New-API 保持一致）
-        self.epay_merchant_id = os.getenv('EPAY_MERCHANT_ID', '1673765678').strip()
-        self.epay_merchant_key = os.getenv('EPAY_MERCHANT_KEY', '').strip()
+        self.epay_merchant_id = env.get('EPAY_MERCHANT_ID', '1673765678').strip()
+        self.epay_merchant_key = env.get('EPAY_MERCHANT_KEY', '').strip()
         
         # 验证 EPay 必需配置
         if not self.epay_merchant_key:
             logger.warning("⚠️  未配置 EPAY_MERCHANT_KEY，EPay 接口将无法使用")
         
         # EPay 回调基础 URL（本服务的公网地址）
-        self.epay_notify_base_url = os.getenv('EPAY_NOTIFY_BASE_URL', 'http://localhost:5000').strip()
+        self.epay_notify_base_url = env.get('EPAY_NOTIFY_BASE_URL', 'http://localhost:5000').strip()
         
         # 数据库配置
-        db_type = os.getenv('DATABASE_TYPE', 'sqlite').lower()
+        db_type = env.get('DATABASE_TYPE', 'sqlite').lower()
         if db_type == 'mysql':
             # MySQL 配置
             self.db_url = (
                 f"mysql+pymysql://"
-                f"{os.getenv('MYSQL_USER', 'root')}:"
-                f"{os.getenv('MYSQL_PASSWORD', 'password')}@"
-                f"{os.getenv('MYSQL_HOST', 'localhost')}:"
-                f"{os.getenv('MYSQL_PORT', '3306')}/"
-                f"{os.getenv('MYSQL_DB', 'alipay_db')}"
+                f"{env.get('MYSQL_USER', 'root')}:"
+                f"{env.get('MYSQL_PASSWORD', 'password')}@"
+                f"{env.get('MYSQL_HOST', 'localhost')}:"
+                f"{env.get('MYSQL_PORT', '3306')}/"
+                f"{env.get('MYSQL_DB', 'alipay_db')}"
             )
         else:
             # SQLite 配置（默认）
-            db_path = os.getenv('SQLITE_PATH', './data/orders.db')
+            db_path = env.get('SQLITE_PATH', './data/orders.db')
             os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
             self.db_url = f"sqlite:///{db_path}"
         
-        logger.info(f"✓ EPay 配置已加载")
-        logger.debug(f"  - 商户 ID: {self.epay_merchant_id}")
-        logger.debug(f"  - 回调地址前缀: {self.epay_notify_base_url}")
-        logger.debug(f"  - 数据库: {db_type}")
+        logger.info("✓ EPay 配置已加载")
+        logger.debug("  - 商户 ID: %s", self.epay_merchant_id)
+        logger.debug("  - 回调地址前缀: %s", self.epay_notify_base_url)
+        logger.debug("  - 数据库: %s", db_type)
 
-    def _load_integration_config(self):
+    def _load_integration_config(self, env: dict):
         """加载集成相关配置"""
-        log_level = os.getenv('LOG_LEVEL', 'INFO').upper()
+        log_level = env.get('LOG_LEVEL', 'INFO').upper()
         self.log_level = log_level
 
         # 日志文件配置
-        self.log_dir = os.getenv('LOG_DIR', './logs').strip()
-        self.log_backup_count = int(os.getenv('LOG_BACKUP_COUNT', '30'))
+        self.log_dir = env.get('LOG_DIR', './logs').strip()
+        self.log_backup_count = int(env.get('LOG_BACKUP_COUNT', '30'))
 
         # Flask 配置
-        self.flask_secret_key = os.getenv('FLASK_SECRET_KEY', 'dev-secret-key-change-in-production')
-        self.flask_env = os.getenv('FLASK_ENV', 'development')
-        self.flask_host = os.getenv('FLASK_HOST', '0.0.0.0')
-        self.flask_port = int(os.getenv('FLASK_PORT', 5000))
+        self.flask_secret_key = env.get('FLASK_SECRET_KEY', 'dev-secret-key-change-in-production')
+        self.flask_env = env.get('FLASK_ENV', 'development')
+        self.flask_host = env.get('FLASK_HOST', '0.0.0.0')
+        self.flask_port = int(env.get('FLASK_PORT', 5000))
 
         # 管理员 API Key（保护敏感接口：退款、撤单、创建支付等）
-        self.admin_api_key = os.getenv('ADMIN_API_KEY', '').strip()
+        self.admin_api_key = env.get('ADMIN_API_KEY', '').strip()
         if not self.admin_api_key:
             logger.warning("⚠️  未配置 ADMIN_API_KEY，敏感管理接口将不可用")
 
-        logger.info(f"✓ 集成配置已加载")
-        logger.debug(f"  - 日志级别: {self.log_level}")
-        logger.debug(f"  - Flask 环境: {self.flask_env}")
+        logger.info("✓ 集成配置已加载")
+        logger.debug("  - 日志级别: %s", self.log_level)
+        logger.debug("  - Flask 环境: %s", self.flask_env)
 
 
 # =====================================================================
@@ -159,6 +175,10 @@ try:
     NOTIFY_URL = config.notify_url
     RETURN_URL = config.return_url
     GATEWAY = config.gateway
+
+    # 支付宝公钥及其验签器在启动时构建一次，回调验签直接复用
+    ALIPAY_PUBLIC_KEY_OBJ = RSA.import_key(base64.b64decode(strip_pem(ALIPAY_PUBLIC_KEY)))
+    ALIPAY_VERIFIER = pkcs1_15.new(ALIPAY_PUBLIC_KEY_OBJ)
     
     # EPay 配置
     EPAY_MERCHANT_ID = config.epay_merchant_id
@@ -175,5 +195,5 @@ except ValueError as e:
     logger.error("配置初始化失败，应用无法启动")
     raise
 except Exception as e:
-    logger.error(f"配置加载出错: {e}")
+    logger.error("配置加载出错: %s", e)
     raise
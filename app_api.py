@@ -18,8 +18,14 @@ import requests
 import threading
 from typing import Any, Optional, Dict, Tuple
 from datetime import datetime
+from decimal import Decimal, InvalidOperation
 from functools import wraps
 
+try:
+    import fcntl
+except ImportError:  # Windows 无 fcntl，仅支持单进程运行（开发服务器）
+    fcntl = None
+
 from flask import Flask, request, jsonify, render_template, Response
 from sqlalchemy import create_engine, Column, String, Float, Integer, DateTime, Text
 from sqlalchemy.ext.declarative import declarative_base
@@ -142,7 +148,7 @@ def require_admin_key(f):
         else:
             provided_key = (request.values.get('api_key') or '').strip()
         if not provided_key or provided_key != config.admin_api_key:
-            logger.warning(f"[AUTH] 管理接口鉴权失败, path={request.path}")
+            logger.warning("[AUTH] 管理接口鉴权失败, path=%s", request.path)
             return error_response("API Key 无效", 403)
         return f(*args, **kwargs)
     return decorated
@@ -163,15 +169,21 @@ def get_db() -> Session:
 
 def validate_amount(amount: Any, field_name: str = "金额") -> float:
     """校验金额参数"""
-    if not amount:
+    if amount is None or amount == '':
         raise ValueError(f"{field_name}不能为空")
+    # 只用 Decimal 解析一次；支付宝金额最多两位小数，多余位数直接拒绝，避免下单时被静默四舍五入
+    # 超出 Decimal 默认精度的数值在 quantize 时抛 InvalidOperation，同样视为格式非法
     try:
-        amount_float = float(amount)
-        if amount_float <= 0:
+        amount_dec = Decimal(str(amount).strip())
+        if not amount_dec.is_finite():
+            raise ValueError(f"{field_name}格式非法")
+        if amount_dec <= 0:
             raise ValueError(f"{field_name}必须大于0")
-        return amount_float
-    except (ValueError, TypeError):
+        if amount_dec != amount_dec.quantize(Decimal('0.01')):
+            raise ValueError(f"{field_name}最多保留两位小数")
+    except InvalidOperation:
         raise ValueError(f"{field_name}格式非法")
+    return float(amount_dec)
 
 
 def validate_required(value: Any, field_name: str) -> str:
@@ -212,7 +224,7 @@ def notify_new_api_async(order: PayOrder):
             notify_params['sign'] = sign
             notify_params['sign_type'] = 'MD5'
             
-            logger.info(f"回调 New-API: {order.notify_url}, params: {notify_params}")
+            logger.info("回调 New-API: %s, params: %s", order.notify_url, notify_params)
             
             # 发送回调
             response = requests.post(
@@ -223,7 +235,7 @@ def notify_new_api_async(order: PayOrder):
             
             # 检查响应
             if response.status_code == 200 and response.text.strip().lower() == 'success':
-                logger.info(f"✓ 回调成功: {order.out_trade_no}")
+                logger.info("✓ 回调成功: %s", order.out_trade_no)
                 
                 # 更新订单状态
                 db = SessionLocal()
@@ -236,13 +248,15 @@ def notify_new_api_async(order: PayOrder):
                         db_order.notify_count += 1
                         db.commit()
                 except Exception as e:
-                    logger.error(f"更新订单状态失败: {e}")
+                    logger.error("更新订单状态失败: %s", e)
                 finally:
                     db.close()
             else:
                 logger.warning(
-                    f"❌ 回调失败: {order.out_trade_no}, "
-                    f"status={response.status_code}, body={response.text[:100]}"
+                    "❌ 回调失败: %s, status=%s, body=%.100s",
+                    order.out_trade_no,
+                    response.status_code,
+                    response.text,
                 )
                 
                 # 增加重试计数
@@ -255,14 +269,14 @@ def notify_new_api_async(order: PayOrder):
                         db_order.notify_count += 1
                         db.commit()
                 except Exception as e:
-                    logger.error(f"更新重试计数失败: {e}")
+                    logger.error("更新重试计数失败: %s", e)
                 finally:
                     db.close()
         
         except requests.RequestException as e:
-            logger.error(f"❌ 回调异常 ({order.out_trade_no}): {e}")
+            logger.error("❌ 回调异常 (%s): %s", order.out_trade_no, e)
         except Exception as e:
-            logger.error(f"❌ 回调异常 ({order.out_trade_no}): {e}")
+            logger.error("❌ 回调异常 (%s): %s", order.out_trade_no, e)
     
     # 在后台线程执行
     thread = threading.Thread(target=do_notify, daemon=True)
@@ -272,6 +286,26 @@ def notify_new_api_async(order: PayOrder):
 # 创建 Flask 应用
 app = Flask(__name__)
 app.secret_key = config.flask_secret_key
+# 生产环境关闭模板自动重载，避免每次渲染都检查模板文件 mtime
+app.config['TEMPLATES_AUTO_RELOAD'] = (config.flask_env == 'development')
+
+# 支付页模板启动时编译一次，下单接口直接渲染，跳过模板查找
+_PAY_TEMPLATE = app.jinja_env.get_template('pay.html')
+
+
+def render_pay_page(**context) -> Response:
+    """
+    渲染支付二维码页面
+
+    生产环境直接使用预编译模板；开发环境开启自动重载时每次经 jinja_env 获取，
+    修改 pay.html 后无需重启即可生效
+    """
+    if app.jinja_env.auto_reload:
+        template = app.jinja_env.get_template('pay.html')
+    else:
+        template = _PAY_TEMPLATE
+    return Response(template.render(**context), mimetype='text/html')
+
 
 logger.info("="*60)
 logger.info("正在初始化 AlipayService...")
@@ -279,7 +313,7 @@ try:
     alipay_service = AlipayService()
     logger.info("✓ AlipayService 初始化成功")
 except Exception as e:
-    logger.error(f"❌ AlipayService 初始化失败: {e}")
+    logger.error("❌ AlipayService 初始化失败: %s", e)
     raise
 logger.info("="*60)
 
@@ -314,18 +348,18 @@ def submit_order():
     else:
         params = request.form.to_dict()
     
-    logger.info(f"[EPay] 收到 /submit.php 请求, params: {params}")
+    logger.info("[EPay] 收到 /submit.php 请求, params: %s", params)
     
     try:
         # 1. 验证签名
         if not verify_epay_sign(params, config.epay_merchant_key):
-            logger.warning(f"[EPay] ❌ 签名验证失败")
+            logger.warning("[EPay] ❌ 签名验证失败")
             return "签名验证失败", 400
         
         # 2. 验证商户 ID
         pid = int(params.get('pid', 0))
         if pid != int(config.epay_merchant_id):
-            logger.warning(f"[EPay] ❌ 商户 ID 不匹配: {pid} != {config.epay_merchant_id}")
+            logger.warning("[EPay] ❌ 商户 ID 不匹配: %s != %s", pid, config.epay_merchant_id)
             return "商户ID不匹配", 400
         
         # 3. 提取参数
@@ -343,10 +377,10 @@ def submit_order():
         ).first()
         
         if existing_order:
-            logger.info(f"[EPay] 订单已存在, 直接返回: {out_trade_no}")
+            logger.info("[EPay] 订单已存在, 直接返回: %s", out_trade_no)
             # 返回已有的支付信息
             if existing_order.qr_code:
-                return render_template('pay.html',
+                return render_pay_page(
                     order_id=out_trade_no,
                     qr_code=existing_order.qr_code,
                     amount=str(existing_order.money),
@@ -354,11 +388,11 @@ def submit_order():
                     return_url=existing_order.return_url or ''
                 )
             else:
-                logger.warning(f"[EPay] 订单已存在但无二维码, 返回错误: {out_trade_no}")
+                logger.warning("[EPay] 订单已存在但无二维码, 返回错误: %s", out_trade_no)
                 return "订单异常，请重新发起支付", 400
         
         # 5. 调用支付宝创建支付
-        logger.info(f"[EPay] 创建支付: order={out_trade_no}, type={pay_type}, amount={money}")
+        logger.info("[EPay] 创建支付: order=%s, type=%s, amount=%s", out_trade_no, pay_type, money)
         
         if pay_type not in ('alipay', 'wxpay'):
             raise ValueError(f"不支持的支付类型: {pay_type}")
@@ -394,10 +428,10 @@ def submit_order():
         db.commit()
         db.refresh(order)
         
-        logger.info(f"[EPay] ✓ 订单已创建: {out_trade_no}")
+        logger.info("[EPay] ✓ 订单已创建: %s", out_trade_no)
         
         # 7. 返回支付页面
-        return render_template('pay.html',
+        return render_pay_page(
             order_id=out_trade_no,
             qr_code=qr_code,
             amount=str(money),
@@ -406,10 +440,10 @@ def submit_order():
         )
     
     except ValueError as e:
-        logger.error(f"[EPay] ❌ 参数错误: {e}")
+        logger.error("[EPay] ❌ 参数错误: %s", e)
         return f"参数错误: {str(e)}", 400
     except Exception as e:
-        logger.error(f"[EPay] ❌ 创建支付失败: {e}", exc_info=True)
+        logger.error("[EPay] ❌ 创建支付失败: %s", e, exc_info=True)
         return f"创建支付失败: {str(e)}", 500
     finally:
         try:
@@ -446,6 +480,14 @@ def check_status():
         if not order:
             return error_response("订单不存在", 404)
         
+        # 异步通知已将订单标记为已支付/已通知时直接返回，
+        # 前端每 2 秒轮询一次，避免每次都占用 worker 线程等待支付宝网关
+        if order.status in (1, 2):
+            return success_response({
+                'status': 1,
+                'message': '支付成功'
+            })
+        
         # 查询支付宝订单状态
         result = alipay_service.query_order(out_trade_no)
         trade_status = result.get('trade_status', '')
@@ -461,12 +503,12 @@ def check_status():
                 order_locked.status = 1  # 标记为已支付
                 order_locked.alipay_trade_no = result.get('trade_no', '')
                 db.commit()
-                logger.info(f"[check-status] ✓ 订单已更新为已支付: {out_trade_no}")
+                logger.info("[check-status] ✓ 订单已更新为已支付: %s", out_trade_no)
                 
                 # 异步回调 New-API
                 notify_new_api_async(order_locked)
             else:
-                logger.info(f"[check-status] 订单已被其他流程处理，跳过回调: {out_trade_no}")
+                logger.info("[check-status] 订单已被其他流程处理，跳过回调: %s", out_trade_no)
             
             return success_response({
                 'status': 1,
@@ -484,7 +526,7 @@ def check_status():
             })
     
     except Exception as e:
-        logger.error(f"查询订单状态失败: {e}")
+        logger.error("查询订单状态失败: %s", e)
         return error_response(str(e), 500)
     finally:
         try:
@@ -515,7 +557,7 @@ def pay_now() -> Response:
 
     amount_float = product['price']
     subject = product['name']
-    out_trade_no = request.args.get('out_trade_no') or str(uuid.uuid4()).replace('-', '')[:20]
+    out_trade_no = request.args.get('out_trade_no') or uuid.uuid4().hex[:20]
 
     db = None
     try:
@@ -524,7 +566,7 @@ def pay_now() -> Response:
         # 幂等：订单已存在则直接返回
         existing = db.query(PayOrder).filter(PayOrder.out_trade_no == out_trade_no).first()
         if existing and existing.qr_code:
-            return render_template('pay.html',
+            return render_pay_page(
                 order_id=out_trade_no,
                 qr_code=existing.qr_code,
                 amount=str(existing.money),
@@ -532,7 +574,7 @@ def pay_now() -> Response:
             )
 
         # 创建支付宝预下单
-        logger.info(f"[paynow] 创建支付: order={out_trade_no}, product={product_id}, amount={amount_float}")
+        logger.info("[paynow] 创建支付: order=%s, product=%s, amount=%s", out_trade_no, product_id, amount_float)
         trade_no = f"PN{datetime.now().strftime('%Y%m%d%H%M%S')}{uuid.uuid4().hex[:8]}"
         qr_code = alipay_service.create_qr_payment(
             out_trade_no=out_trade_no,
@@ -557,9 +599,9 @@ def pay_now() -> Response:
         )
         db.add(order)
         db.commit()
-        logger.info(f"[paynow] ✓ 订单已入库: {out_trade_no}")
+        logger.info("[paynow] ✓ 订单已入库: %s", out_trade_no)
 
-        return render_template('pay.html',
+        return render_pay_page(
             order_id=out_trade_no,
             qr_code=qr_code,
             amount=str(amount_float),
@@ -567,7 +609,7 @@ def pay_now() -> Response:
         )
 
     except Exception as e:
-        logger.error(f"[paynow] ❌ 创建支付失败: {e}")
+        logger.error("[paynow] ❌ 创建支付失败: %s", e)
         return f"支付创建失败：{str(e)}", 500
     finally:
         if db:
@@ -585,9 +627,16 @@ def test_page():
 
 # 账号文件路径（每行一条 "账号|密码"），位于项目根目录
 ACCOUNTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'accounts.txt')
+# 线程锁只在单进程内有效，多进程（gunicorn 多 worker）还需配合 _lock_file 文件锁
 _accounts_lock = threading.Lock()
 
 
+def _lock_file(f) -> None:
+    """对已打开的文件加排他锁（进程间互斥），文件关闭时自动释放"""
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+
 @app.route('/api/account-stock', methods=['GET'])
 def account_stock():
     """查询 accounts.txt 剩余可用账号数量"""
@@ -598,7 +647,7 @@ def account_stock():
             count = sum(1 for line in f if line.strip() and '|' in line)
         return success_response({'stock': count})
     except Exception as e:
-        logger.error(f"[ACCOUNT] 查询库存失败: {e}")
+        logger.error("[ACCOUNT] 查询库存失败: %s", e)
         return error_response(str(e), 500)
 
 
@@ -625,17 +674,17 @@ def get_account():
 
         # 【安全修复】订单必须在数据库中存在（仅通过 /submit.php 创建的订单才有效）
         if not order:
-            logger.warning(f"[ACCOUNT] 订单不在数据库中, 拒绝: {out_trade_no}")
+            logger.warning("[ACCOUNT] 订单不在数据库中, 拒绝: %s", out_trade_no)
             return error_response("订单不存在（仅支持通过正规渠道创建的订单）", 403)
 
         # 【安全修复】防重放：同一订单只能发放一次账号
         if order.account_dispensed == 1:
-            logger.warning(f"[ACCOUNT] 订单已发放过账号, 拒绝重复发放: {out_trade_no}")
+            logger.warning("[ACCOUNT] 订单已发放过账号, 拒绝重复发放: %s", out_trade_no)
             return error_response("该订单已领取过账号，不可重复领取", 403)
 
         # 【安全修复】强制校验金额（不再短路跳过）
         if order.money is None or order.money < min_price:
-            logger.warning(f"[ACCOUNT] 金额不足: order={out_trade_no}, money={order.money}, min={min_price}")
+            logger.warning("[ACCOUNT] 金额不足: order=%s, money=%s, min=%s", out_trade_no, order.money, min_price)
             return error_response(f"支付金额不足（需 {min_price} 元）", 403)
 
         # 校验支付状态
@@ -665,30 +714,33 @@ def get_account():
         if not os.path.exists(ACCOUNTS_FILE):
             return error_response(f"账号文件不存在: {ACCOUNTS_FILE}", 500)
         try:
-            with open(ACCOUNTS_FILE, 'r', encoding='utf-8') as f:
+            with open(ACCOUNTS_FILE, 'r+', encoding='utf-8') as f:
+                # 进程间文件锁：gunicorn 多 worker 时防止重复发放同一账号，关闭文件时自动释放
+                _lock_file(f)
                 lines = f.readlines()
 
-            # 找到第一条非空行
-            first_idx = -1
-            first_line = ''
-            for i, line in enumerate(lines):
-                if line.strip():
-                    first_idx = i
-                    first_line = line.strip()
-                    break
-
-            if first_idx < 0:
-                return error_response("账号库已空，请补充 accounts.txt", 500)
-
-            # 解析 账号|密码
-            if '|' not in first_line:
-                return error_response(f"账号行格式错误（应为 账号|密码）: {first_line}", 500)
-            account, password = first_line.split('|', 1)
-
-            # 移除该行
-            remaining = lines[:first_idx] + lines[first_idx + 1:]
-            with open(ACCOUNTS_FILE, 'w', encoding='utf-8') as f:
+                # 找到第一条非空行
+                first_idx = -1
+                first_line = ''
+                for i, line in enumerate(lines):
+                    if line.strip():
+                        first_idx = i
+                        first_line = line.strip()
+                        break
+
+                if first_idx < 0:
+                    return error_response("账号库已空，请补充 accounts.txt", 500)
+
+                # 解析 账号|密码
+                if '|' not in first_line:
+                    return error_response(f"账号行格式错误（应为 账号|密码）: {first_line}", 500)
+                account, password = first_line.split('|', 1)
+
+                # 移除该行（原地重写，持锁期间完成）
+                remaining = lines[:first_idx] + lines[first_idx + 1:]
+                f.seek(0)
                 f.writelines(remaining)
+                f.truncate()
 
             # 【安全修复】标记订单为已发放，防止重复领取
             db2 = SessionLocal()
@@ -700,17 +752,17 @@ def get_account():
                     db_order.account_dispensed = 1
                     db2.commit()
             except Exception as e:
-                logger.error(f"[ACCOUNT] 标记已发放失败: {e}")
+                logger.error("[ACCOUNT] 标记已发放失败: %s", e)
             finally:
                 db2.close()
 
-            logger.info(f"[ACCOUNT] 发放账号 order={out_trade_no}, account={account}")
+            logger.info("[ACCOUNT] 发放账号 order=%s, account=%s", out_trade_no, account)
             return success_response({
                 'account': account.strip(),
                 'password': password.strip(),
             })
         except Exception as e:
-            logger.error(f"[ACCOUNT] 读取账号失败: {e}", exc_info=True)
+            logger.error("[ACCOUNT] 读取账号失败: %s", e, exc_info=True)
             return error_response(f"读取账号失败: {str(e)}", 500)
 
 
@@ -722,17 +774,17 @@ def query_order(order_id):
         return jsonify({'code': -1, 'message': '订单号不能为空'}), 400
     
     try:
-        logger.info(f"查询订单: order_id={order_id}")
+        logger.info("查询订单: order_id=%s", order_id)
         result = alipay_service.query_order(order_id)
         
         if not isinstance(result, dict):
-            logger.error(f"❌ 查询订单: 返回格式异常")
+            logger.error("❌ 查询订单: 返回格式异常")
             return jsonify({'code': -1, 'message': '查询结果格式异常'}), 500
         
         trade_status = result.get('trade_status', '未知')
         total_amount = result.get('total_amount', '')
         
-        logger.info(f"✓ 查询订单成功: order_id={order_id}, status={trade_status}")
+        logger.info("✓ 查询订单成功: order_id=%s, status=%s", order_id, trade_status)
         
         return jsonify({
             'code': 0,
@@ -743,7 +795,7 @@ def query_order(order_id):
         }), 200
         
     except Exception as e:
-        logger.error(f"❌ 查询订单异常: {e}")
+        logger.error("❌ 查询订单异常: %s", e)
         return jsonify({'code': -1, 'message': str(e)}), 500
 
 
@@ -756,14 +808,14 @@ def cancel_order(order_id):
         return jsonify({'code': -1, 'message': '订单号不能为空'}), 400
     
     try:
-        logger.info(f"撤销订单: order_id={order_id}")
+        logger.info("撤销订单: order_id=%s", order_id)
         result = alipay_service.cancel_order(order_id)
         
-        logger.info(f"✓ 撤销订单成功: order_id={order_id}")
+        logger.info("✓ 撤销订单成功: order_id=%s", order_id)
         return jsonify({'code': 0, 'data': result}), 200
         
     except Exception as e:
-        logger.error(f"❌ 撤销订单异常: {e}")
+        logger.error("❌ 撤销订单异常: %s", e)
         return jsonify({'code': -1, 'message': str(e)}), 500
 
 
@@ -779,68 +831,74 @@ def refund() -> Tuple:
         amount_float = validate_amount(data.get('refund_amount'), "退款金额")
         refund_reason = str(data.get('reason', '')).strip()
     except ValueError as e:
-        logger.warning(f"❌ 退款参数校验失败: {e}")
+        logger.warning("❌ 退款参数校验失败: %s", e)
         return error_response(str(e))
 
     try:
-        logger.info(f"退款: order_id={order_id}, amount={amount_float}, reason={refund_reason}")
+        logger.info("退款: order_id=%s, amount=%s, reason=%s", order_id, amount_float, refund_reason)
         result = alipay_service.refund(
             out_trade_no=order_id,
             refund_amount=amount_float,
             refund_reason=refund_reason,
         )
 
-        logger.info(f"✓ 退款成功: order_id={order_id}, amount={amount_float}")
+        logger.info("✓ 退款成功: order_id=%s, amount=%s", order_id, amount_float)
 
         return success_response({'data': result, 'message': '退款成功'})
 
     except Exception as e:
-        logger.error(f"❌ 退款异常: {e}")
+        logger.error("❌ 退款异常: %s", e)
         return error_response(str(e), 500)
 
 
 @app.route('/api/notify', methods=['POST'])
 def alipay_notify():
     """支付宝异步通知回调"""
-    params = request.form.to_dict()
-    logger.info(f"[NOTIFY] 收到支付宝回调，参数: {params}")
+    form = request.form
 
-    # 取出 sign，同时排除 sign_type（支付宝验签规则：两者都不参与签名）
-    sign = params.pop('sign', None)
-    params.pop('sign_type', None)
+    # 直接读取表单，不再复制为 dict
+    sign = form.get('sign')
+    logger.info("[NOTIFY] 收到支付宝回调，参数: %s", form)
 
     if not sign:
         logger.error("[NOTIFY] 回调中没有 sign 字段，验签失败")
         return 'fail'
 
-    # 按参数名升序排列，过滤空值，拼接待验签串
-    sign_content = '&'.join(
-        f"{k}={v}" for k, v in sorted(params.items()) if v
-    )
-    logger.debug(f"[NOTIFY] 待验签字符串: {sign_content[:100]}...")
+    # 缺少订单号的回调无法处理，直接拒绝，省去排序拼接和 RSA 验签
+    if not form.get('out_trade_no'):
+        logger.error("[NOTIFY] 回调中没有 out_trade_no 字段，直接拒绝")
+        return 'fail'
+
+    # 排除 sign、sign_type 和空值（支付宝验签规则），按参数名升序拼接待验签串
+    items = [(k, v) for k, v in form.items() if v and k != 'sign' and k != 'sign_type']
+    items.sort()
+    sign_content = '&'.join([k + '=' + v for k, v in items])
+    logger.debug("[NOTIFY] 待验签字符串: %.100s...", sign_content)
 
-    # 使用配置中的公钥验签
-    if not verify_sign(sign_content, sign, config.alipay_public_key):
-        logger.error(f"[NOTIFY] ❌ 验签失败! sign={sign[:50]}...")
+    # 使用启动时预构建的支付宝公钥验签器验签
+    if not verify_sign(sign_content, sign):
+        logger.error("[NOTIFY] ❌ 验签失败! sign=%.50s...", sign)
         return 'fail'
 
     logger.info("[NOTIFY] ✓ 验签成功")
 
     # 提取关键信息
-    trade_status = params.get('trade_status', '')
-    out_trade_no = params.get('out_trade_no', '')
-    trade_no = params.get('trade_no', '')
-    total_amount = params.get('total_amount', '')
+    trade_status = form.get('trade_status', '')
+    out_trade_no = form.get('out_trade_no', '')
+    trade_no = form.get('trade_no', '')
+    total_amount = form.get('total_amount', '')
 
     logger.info(
-        f"[NOTIFY] 交易信息: "
-        f"status={trade_status}, order_id={out_trade_no}, "
-        f"trade_no={trade_no}, amount={total_amount}"
+        "[NOTIFY] 交易信息: status=%s, order_id=%s, trade_no=%s, amount=%s",
+        trade_status,
+        out_trade_no,
+        trade_no,
+        total_amount,
     )
 
     # 处理不同的交易状态
     if trade_status in ('TRADE_SUCCESS', 'TRADE_FINISHED'):
-        logger.info(f"[NOTIFY] ✓ 订单已支付: {out_trade_no}")
+        logger.info("[NOTIFY] ✓ 订单已支付: %s", out_trade_no)
         
         # 更新订单状态
         try:
@@ -856,13 +914,15 @@ def alipay_notify():
                         callback_amount = float(total_amount)
                         if abs(callback_amount - order.money) > 0.01:
                             logger.error(
-                                f"[NOTIFY] ❌ 金额不一致! 订单={order.money}, 回调={callback_amount}, "
-                                f"order={out_trade_no}"
+                                "[NOTIFY] ❌ 金额不一致! 订单=%s, 回调=%s, order=%s",
+                                order.money,
+                                callback_amount,
+                                out_trade_no,
                             )
                             db.close()
                             return 'fail'
                     except (ValueError, TypeError):
-                        logger.error(f"[NOTIFY] ❌ 回调金额格式异常: {total_amount}")
+                        logger.error("[NOTIFY] ❌ 回调金额格式异常: %s", total_amount)
                         db.close()
                         return 'fail'
 
@@ -876,29 +936,29 @@ def alipay_notify():
                     order_locked.status = 1  # 标记为已支付
                     order_locked.alipay_trade_no = trade_no
                     db.commit()
-                    logger.info(f"[NOTIFY] ✓ 订单状态已更新: {out_trade_no}")
+                    logger.info("[NOTIFY] ✓ 订单状态已更新: %s", out_trade_no)
                     
                     # 异步回调 New-API
                     notify_new_api_async(order_locked)
                 else:
-                    logger.info(f"[NOTIFY] 订单已被其他流程处理，跳过回调: {out_trade_no}")
+                    logger.info("[NOTIFY] 订单已被其他流程处理，跳过回调: %s", out_trade_no)
             
             db.close()
         except Exception as e:
-            logger.error(f"处理支付宝通知异常: {e}", exc_info=True)
+            logger.error("处理支付宝通知异常: %s", e, exc_info=True)
         
         return 'success'
 
     elif trade_status == 'TRADE_CLOSED':
-        logger.info(f"[NOTIFY] ⚠ 订单已关闭: {out_trade_no}")
+        logger.info("[NOTIFY] ⚠ 订单已关闭: %s", out_trade_no)
         return 'success'
 
     elif trade_status == 'WAIT_BUYER_PAY':
-        logger.info(f"[NOTIFY] ⏳ 订单待支付: {out_trade_no}")
+        logger.info("[NOTIFY] ⏳ 订单待支付: %s", out_trade_no)
         return 'success'
 
     else:
-        logger.warning(f"[NOTIFY] 未处理的交易状态: {trade_status}")
+        logger.warning("[NOTIFY] 未处理的交易状态: %s", trade_status)
         return 'success'
 
 
@@ -908,15 +968,18 @@ def alipay_notify_check():
     return 'notify endpoint ok', 200
 
 
+# 生产环境请使用 gunicorn 启动（多 worker + 线程池）：
+#     gunicorn -c gunicorn_conf.py wsgi:app
+# 以下 Werkzeug 开发服务器仅用于本地调试
 if __name__ == '__main__':
     """启动 Flask 应用服务器"""
     logger.info("="*60)
-    logger.info(f"🚀 启动 Flask 应用【改造版 - 支持 New-API】")
-    logger.info(f"  - 地址: {config.flask_host}:{config.flask_port}")
-    logger.info(f"  - 环境: {config.flask_env}")
-    logger.info(f"  - 支付宝沙箱: {config.is_sandbox}")
-    logger.info(f"  - EPay 商户ID: {config.epay_merchant_id}")
-    logger.info(f"  - 数据库: {config.db_url}")
+    logger.info("🚀 启动 Flask 应用【改造版 - 支持 New-API】")
+    logger.info("  - 地址: %s:%s", config.flask_host, config.flask_port)
+    logger.info("  - 环境: %s", config.flask_env)
+    logger.info("  - 支付宝沙箱: %s", config.is_sandbox)
+    logger.info("  - EPay 商户ID: %s", config.epay_merchant_id)
+    logger.info("  - 数据库: %s", config.db_url)
     logger.info("="*60)
     
     app.run(
@@ -66,12 +66,12 @@ def sign_epay(params: Dict[str, str], merchant_key: str) -> str:
     # 末尾直接追加商户密钥（无 & 分隔符）
     sign_string += merchant_key
     
-    logger.debug(f"EPay 签名字符串: {sign_string[:100]}...")
+    logger.debug("EPay 签名字符串: %.100s...", sign_string)
     
     # 计算 MD5
     md5_hash = hashlib.md5(sign_string.encode('utf-8')).hexdigest().lower()
     
-    logger.debug(f"生成的签名: {md5_hash}")
+    logger.debug("生成的签名: %s", md5_hash)
     return md5_hash
 
 
@@ -112,9 +112,9 @@ def verify_epay_sign(params: Dict[str, str], merchant_key: str) -> bool:
     if valid:
         logger.info("✓ EPay 签名验证成功")
     else:
-        logger.warning(f"❌ EPay 签名验证失败")
-        logger.debug(f"   期望: {calculated_sign}")
-        logger.debug(f"   实际: {sign_to_verify}")
+        logger.warning("❌ EPay 签名验证失败")
+        logger.debug("   期望: %s", calculated_sign)
+        logger.debug("   实际: %s", sign_to_verify)
     
     return valid
 
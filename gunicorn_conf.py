@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""
+gunicorn 生产部署配置
+
+业务以等待支付宝网关响应为主（网络 IO 密集），
+使用 gthread 线程 worker，慢请求不会阻塞其他请求。
+
+启动方式：
+    gunicorn -c gunicorn_conf.py wsgi:app
+"""
+
+import multiprocessing
+import os
+from pathlib import Path
+from dotenv import load_dotenv
+
+# gunicorn 主进程读取本文件时应用尚未导入，先加载 .env，
+# 使 FLASK_HOST / FLASK_PORT 只配置在 .env 中时也能生效
+load_dotenv(Path(__file__).parent / '.env')
+
+# 监听地址（与 .env 中 FLASK_HOST / FLASK_PORT 保持一致）
+bind = f"{os.getenv('FLASK_HOST', '0.0.0.0')}:{os.getenv('FLASK_PORT', '5000')}"
+
+# worker 配置
+workers = multiprocessing.cpu_count() * 2 + 1
+worker_class = 'gthread'
+threads = 8
+
+# 支付宝请求超时为 30 秒，这里留出余量
+timeout = 60
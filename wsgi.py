@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+"""
+WSGI 入口 - 供 gunicorn 等生产服务器加载
+
+启动方式：
+    gunicorn -c gunicorn_conf.py wsgi:app
+"""
+
+from app_api import app
+
+__all__ = ['app']